@@ -0,0 +1,43 @@
+#!/bin/sh
+# launch.sh: 本番用の起動スクリプト
+# uvloop（イベントループ）と httptools（HTTP パーサ）を使い、複数ワーカーで起動する。
+#
+# 環境変数で設定を変えられる:
+#   HOST     待ち受けアドレス（既定: 0.0.0.0）
+#   PORT     ポート番号（既定: 8000）
+#   WORKERS  ワーカー数（既定: 4）
+#   CPUS     ワーカーを固定する CPU（taskset -c の書式。既定: 0-3。空なら固定しない）
+#
+# 例: WORKERS=8 CPUS=0-7 ./launch.sh
+set -eu
+
+cd "$(dirname "$0")"
+
+HOST="${HOST:-0.0.0.0}"
+PORT="${PORT:-8000}"
+WORKERS="${WORKERS:-4}"
+CPUS="${CPUS-0-3}"
+
+# 複数のワーカーが同時にテーブルを作ろうとしないよう、起動前に一度だけ作っておく
+python -c 'import asyncio, mydict
+
+async def main():
+    await mydict.init_db()
+    await mydict.engine.dispose()
+
+asyncio.run(main())'
+
+set -- uvicorn mydict:app \
+    --host "$HOST" \
+    --port "$PORT" \
+    --workers "$WORKERS" \
+    --loop uvloop \
+    --http httptools \
+    --backlog 2048 \
+    --limit-concurrency 1000
+
+# taskset があれば（Linux）ワーカーを指定の CPU に固定する
+if [ -n "$CPUS" ] && command -v taskset >/dev/null 2>&1; then
+    exec taskset -c "$CPUS" "$@"
+fi
+exec "$@"
@@ -1,30 +1,69 @@
 # mydict.py
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi import Request
 from fastapi.responses import RedirectResponse
+from fastapi import Response
 from fastapi import Form
+from fastapi import Depends
 from fastapi.templating import Jinja2Templates
-from pydantic import BaseModel
-from sqlalchemy import create_engine, Column, Integer, String, Text
-from sqlalchemy.orm import declarative_base, sessionmaker
+from jinja2 import FileSystemBytecodeCache
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Index, select, update, event, or_, func, case, text, literal_column
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.sql.elements import Grouping
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from typing import Optional, List
 from collections import defaultdict
+from contextlib import asynccontextmanager
 from fastapi.staticfiles import StaticFiles
 import os
+import time
+import hashlib
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./terms.db")
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./terms.db")
+# DEBUG=1 のときはテンプレートの変更を自動で再読込する
+DEBUG = os.getenv("DEBUG", "").lower() in ("1", "true")
 
+# 同期ドライバの URL が渡された場合は非同期ドライバに読み替える
 if DATABASE_URL.startswith("sqlite:///"):
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False}
-    )
-else:
-    engine = create_engine(DATABASE_URL)
+    DATABASE_URL = DATABASE_URL.replace("sqlite:///", "sqlite+aiosqlite:///", 1)
+elif DATABASE_URL.startswith("postgres://"):
+    DATABASE_URL = DATABASE_URL.replace("postgres://", "postgresql+asyncpg://", 1)
+elif DATABASE_URL.startswith("postgresql://"):
+    DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+# コネクションプール: 接続をリクエスト間で使い回し、接続ごとの初期化コストを避ける
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_size=10,
+    max_overflow=20,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    # コンパイル済み SQL のキャッシュ（既定は 500 件）
+    query_cache_size=1200,
+)
 
-# sessionmaker: DB セッションを作るためのファクトリ
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# SQLite の PRAGMA は接続作成時に一度だけ設定する
+# WAL: 読み込みと書き込みを並行させる / mmap: ページ読み込みのコピーを省く
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_sqlite_pragma(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-65536")      # 64 MB
+        cursor.execute("PRAGMA mmap_size=268435456")    # 256 MB
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+# async_sessionmaker: 非同期 DB セッションを作るためのファクトリ
+# expire_on_commit=False: commit 後も属性を再読込せずに参照できるようにする
+SessionLocal = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
 
 # Base: ORM のベースクラス
 Base = declarative_base()
@@ -40,176 +79,420 @@ class Term(Base):
     description = Column(Text, nullable=False)                   # 説明文（長文可）
     image_url = Column(String, nullable=True)                    # 画像URL（任意）
 
-# テーブルを作成（無ければ作る）
-Base.metadata.create_all(bind=engine)
+# terms の更新回数。/terms のキャッシュと ETag に使う（複数ワーカー間で共有するため DB に持つ）
+# DB を作り直したときに古い ETag と衝突しないよう、行を作った時刻（ns）から数え始める
+class TermsVersion(Base):
+    __tablename__ = "terms_version"
+    id = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)    # 時刻（ns）を入れるので 64 bit
+
+# 並び順（読み→単語順）: 読みが空なら単語で並べる
+# 式インデックスと同じ SQL になるよう、'' はバインド変数ではなくリテラルで書く
+TERM_ORDER = case((func.trim(Term.reading) != literal_column("''"), Term.reading), else_=Term.word)
+# PostgreSQL は式インデックスの式が列・関数以外なら括弧が必要なので Grouping で囲む
+TERM_ORDER_INDEX = Index("ix_terms_order", Grouping(TERM_ORDER), Term.word)
+
+# =====================
+# 全文検索 (SQLite FTS5)
+# =====================
+# terms を外部コンテンツとする FTS5 テーブル。trigram トークナイザで部分一致検索ができる。
+# トリガーで terms の変更に追従させる。
+# 注意: トリガーがある DB に trigram の無い SQLite（3.34 未満。古い sqlite3 CLI や別ホストなど）から
+# 書き込むと、トリガー内の terms_fts 更新が失敗して terms への書き込みもすべて失敗する。
+# アプリ自身は起動時に trigram の有無を確かめ、使えなければトリガーを外して LIKE 検索に切り替える。
+FTS_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS terms_fts USING fts5(
+        word, reading, description,
+        content='terms', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS terms_fts_ai AFTER INSERT ON terms BEGIN
+        INSERT INTO terms_fts(rowid, word, reading, description)
+        VALUES (new.id, new.word, new.reading, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS terms_fts_ad AFTER DELETE ON terms BEGIN
+        INSERT INTO terms_fts(terms_fts, rowid, word, reading, description)
+        VALUES ('delete', old.id, old.word, old.reading, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS terms_fts_au AFTER UPDATE ON terms BEGIN
+        INSERT INTO terms_fts(terms_fts, rowid, word, reading, description)
+        VALUES ('delete', old.id, old.word, old.reading, old.description);
+        INSERT INTO terms_fts(rowid, word, reading, description)
+        VALUES (new.id, new.word, new.reading, new.description);
+    END""",
+]
+
+# trigram は 3 文字未満の検索語に使えないため、それより短い検索語は LIKE で探す
+FTS_MIN_QUERY_LENGTH = 3
+
+# 起動時に FTS5 テーブルを用意できたら True
+FTS_ENABLED = False
+
+FTS_TRIGGERS = ["terms_fts_ai", "terms_fts_ad", "terms_fts_au"]
+
+async def sqlite_has_trigram(conn) -> bool:
+    """この SQLite で FTS5 の trigram トークナイザが使えるか"""
+    try:
+        await conn.execute(text("CREATE VIRTUAL TABLE temp.fts_probe USING fts5(x, tokenize='trigram')"))
+    except OperationalError:
+        return False
+    await conn.execute(text("DROP TABLE temp.fts_probe"))
+    return True
+
+async def setup_fts():
+    global FTS_ENABLED
+    if not DATABASE_URL.startswith("sqlite"):
+        return
+    async with engine.begin() as conn:
+        if not await sqlite_has_trigram(conn):
+            # terms_fts を更新できないので、トリガーを外して terms への書き込みを通す（検索は LIKE のまま）
+            for name in FTS_TRIGGERS:
+                await conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+            return
+
+        exists = await conn.scalar(text("SELECT 1 FROM sqlite_master WHERE name = 'terms_fts'"))
+        names = ", ".join(f"'{name}'" for name in FTS_TRIGGERS)
+        triggers = await conn.scalar(
+            text(f"SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name IN ({names})")
+        )
+        for ddl in FTS_DDL:
+            await conn.execute(text(ddl))
+        # 既存データから索引を作る（初回、またはトリガーが外されていて索引が古い場合）
+        if not exists or triggers < len(FTS_TRIGGERS):
+            await conn.execute(text("INSERT INTO terms_fts(terms_fts) VALUES ('rebuild')"))
+    FTS_ENABLED = True
+
+def fts_match(keywords: List[str]):
+    """いずれかの検索語に部分一致する Term.id を返すサブクエリ"""
+    # 各語をフレーズとして渡し、FTS5 の演算子として解釈されないようにする
+    match = " OR ".join('"' + k.replace('"', '""') + '"' for k in keywords)
+    return text("SELECT rowid FROM terms_fts WHERE terms_fts MATCH :q").bindparams(q=match).columns(rowid=Integer)
 
 # =====================
 # FastAPI アプリ本体
 # =====================
-app = FastAPI(title="MyDictionary (Terms)")
+async def init_db():
+    # テーブルを作成（無ければ作る）
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # 既存の terms テーブルには create_all がインデックスを足さないので個別に作る
+        await conn.execute(CreateIndex(TERM_ORDER_INDEX, if_not_exists=True))
+        await conn.execute(text("DROP INDEX IF EXISTS ix_terms_reading_word"))
+        # 以前のビルドが PostgreSQL に INTEGER（32 bit）で作った version を BIGINT に広げ、
+        # 時刻（ns）から数え直す
+        if engine.dialect.name == "postgresql":
+            data_type = await conn.scalar(text(
+                "SELECT data_type FROM information_schema.columns "
+                "WHERE table_schema = current_schema() AND table_name = 'terms_version' AND column_name = 'version'"
+            ))
+            if data_type == "integer":
+                await conn.execute(text("ALTER TABLE terms_version ALTER COLUMN version TYPE BIGINT"))
+                await conn.execute(update(TermsVersion).values(version=time.time_ns()))
+        if await conn.scalar(select(TermsVersion.id)) is None:
+            await conn.execute(TermsVersion.__table__.insert().values(id=1, version=time.time_ns()))
+    await setup_fts()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await init_db()
+    # テンプレートを先に読み込んでおき、最初のリクエストでのコンパイルを避ける
+    for name in ("index.html", "add.html", "edit.html"):
+        templates.get_template(name)
+    yield
+    await engine.dispose()
+
+# JSON のエンコードは orjson で行う
+app = FastAPI(title="MyDictionary (Terms)", lifespan=lifespan, default_response_class=ORJSONResponse)
 templates = Jinja2Templates(directory="templates")
+# 本番ではテンプレートの更新チェック（stat）を省き、コンパイル結果をファイルにキャッシュする
+templates.env.auto_reload = DEBUG
+templates.env.bytecode_cache = FileSystemBytecodeCache()
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 # Pydantic 用のスキーマ（受け取り／返却用）
 class TermCreate(BaseModel):
+    # 変更不可・未定義フィールド禁止にして検証を単純にする
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     word: str
     reading: Optional[str] = None
     description: str
     image_url: Optional[str] = None
 
 class TermOut(BaseModel):
+    # ORM の Term をそのまま返せるようにする（変更不可・未定義フィールド禁止）
+    model_config = ConfigDict(frozen=True, extra="forbid", from_attributes=True)
+
     id: int
     word: str
     reading: Optional[str] = None
     description: str
     image_url: Optional[str] = None
 
+# 一覧の変換・JSON 化用（スキーマの構築は起動時の一度だけ）
+TERMS_ADAPTER = TypeAdapter(List[TermOut])
+
+# /terms のレスポンスキャッシュ（ワーカーごと、最大 TERMS_CACHE_SIZE 件の LRU）
+# 値は (TermsVersion.version, JSON 本文)。version が変わっていれば使わない
+# メモリを抑えるため、本文の合計が TERMS_CACHE_MAX_TOTAL_BYTES を超えないよう古いものから追い出し、
+# TERMS_CACHE_MAX_BYTES を超える本文はキャッシュしない（ワーカーあたり最大でも約 16 MiB）
+TERMS_CACHE: dict[tuple, tuple[int, bytes]] = {}
+TERMS_CACHE_SIZE = 128
+TERMS_CACHE_MAX_BYTES = 1024 * 1024
+TERMS_CACHE_MAX_TOTAL_BYTES = 16 * 1024 * 1024
+terms_cache_bytes = 0
+
+def store_terms_cache(key: tuple, version: int, body: bytes):
+    global terms_cache_bytes
+    old = TERMS_CACHE.pop(key, None)
+    if old is not None:
+        terms_cache_bytes -= len(old[1])
+    while TERMS_CACHE and (
+        len(TERMS_CACHE) >= TERMS_CACHE_SIZE
+        or terms_cache_bytes + len(body) > TERMS_CACHE_MAX_TOTAL_BYTES
+    ):
+        _, evicted = TERMS_CACHE.pop(next(iter(TERMS_CACHE)))
+        terms_cache_bytes -= len(evicted)
+    TERMS_CACHE[key] = (version, body)
+    terms_cache_bytes += len(body)
+
+# /terms をストリーミングするときに一度に読み込む行数
+TERMS_STREAM_BATCH = 500
+
+# version の読み込み結果をワーカー内で TERMS_VERSION_TTL 秒だけ使い回し、
+# キャッシュヒットや 304 のときは DB に触れずに返す。
+# そのため他のワーカーでの更新は最大 TERMS_VERSION_TTL 秒遅れて反映される（自ワーカーの更新はすぐ反映）
+TERMS_VERSION_TTL = 1.0
+terms_version_cached: int | None = None
+terms_version_expires = 0.0
+
+async def get_terms_version() -> int:
+    global terms_version_cached, terms_version_expires
+    now = time.monotonic()
+    if terms_version_cached is None or now >= terms_version_expires:
+        async with SessionLocal() as session:
+            terms_version_cached = await session.scalar(select(TermsVersion.version))
+        terms_version_expires = now + TERMS_VERSION_TTL
+    return terms_version_cached
+
+def expire_terms_version():
+    """自ワーカーで更新した直後に呼び、次の /terms で version を読み直させる"""
+    global terms_version_expires
+    terms_version_expires = 0.0
+
+async def bump_terms_version(session: AsyncSession):
+    """用語の変更と同じトランザクションで version を進め、全ワーカーのキャッシュを無効にする"""
+    await session.execute(update(TermsVersion).values(version=TermsVersion.version + 1))
+
 # Dependency helper: セッション取得
-def get_session():
-    session = SessionLocal()
-    try:
+async def get_session():
+    async with SessionLocal() as session:
         yield session
-    finally:
-        session.close()
+
+class SessionStreamingResponse(StreamingResponse):
+    """
+    送信が終わったら、本文の送信を始める前に失敗した場合も含めてセッションを閉じる StreamingResponse。
+    （本文のジェネレータの finally だけでは、ジェネレータが一度も動かないと閉じられない）
+    """
+    def __init__(self, content, session: AsyncSession, **kwargs):
+        super().__init__(content, **kwargs)
+        self.session = session
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.session.close()
 
 # ---------------------
 # エンドポイント
 # ---------------------
 
 @app.get("/", response_model=dict)
-def read_root():
+async def read_root():
     return {"message": "Welcome to MyDictionary (Terms) API"}
 
 @app.get("/add", response_class=HTMLResponse)
-def add_page(request: Request):
+async def add_page(request: Request):
     return templates.TemplateResponse("add.html", {"request": request})
 
 @app.post("/add_term", response_model=dict)
-def add_term(item: TermCreate):
+async def add_term(item: TermCreate, session: AsyncSession = Depends(get_session)):
     """
     新しい用語を追加する。
     JSON ボディで { "word": "...", "reading": "...", "description": "...", "image_url": "..." }
     """
-    session = SessionLocal()
+    term = Term(
+        word=item.word,
+        reading=item.reading,
+        description=item.description,
+        image_url=item.image_url,
+    )
+    session.add(term)
+    await bump_terms_version(session)
+    # 重複チェック（word のユニーク制約に任せる）
     try:
-        # 重複チェック（word がユニーク）
-        existing = session.query(Term).filter(Term.word == item.word).first()
-        if existing:
-            raise HTTPException(status_code=400, detail="その用語は既に存在します。")
-
-        term = Term(
-            word=item.word,
-            reading=item.reading,
-            description=item.description,
-            image_url=item.image_url,
-        )
-        session.add(term)
-        session.commit()
-        session.refresh(term)
-        return {"message": f"{term.word} を追加しました。", "id": term.id}
-    finally:
-        session.close()
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(status_code=400, detail="その用語は既に存在します。")
+    expire_terms_version()
+    return {"message": f"{term.word} を追加しました。", "id": term.id}
+
+@app.post("/add_terms", response_model=dict)
+async def add_terms(items: List[TermCreate], session: AsyncSession = Depends(get_session)):
+    """
+    複数の用語をまとめて追加する。
+    JSON ボディで [{ "word": "...", ... }, ...] を受け取り、1 回のトランザクションで登録する。
+    既に存在する用語（word が重複するもの）は追加せずにスキップする。
+    """
+    if not items:
+        return {"message": "0 件の用語を追加しました。", "added": 0, "skipped": 0}
+
+    # ORM を通さず Core の INSERT で一括登録し、重複は DB 側で無視する
+    dialect = postgresql if engine.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(Term).on_conflict_do_nothing(index_elements=["word"]).returning(Term.id)
+    result = await session.execute(stmt, [item.model_dump() for item in items])
+    added = len(result.all())
+    if added:
+        await bump_terms_version(session)
+    await session.commit()
+    if added:
+        expire_terms_version()
+    return {"message": f"{added} 件の用語を追加しました。", "added": added, "skipped": len(items) - added}
 
 from fastapi import Query
 
+# LIMIT / OFFSET に渡せる上限（SQLite・PostgreSQL の 64 bit 整数）
+SQL_INT_MAX = 2**63 - 1
+
 @app.get("/terms", response_model=List[TermOut])
-def list_terms(query: str | None = Query(None)):
+async def list_terms(
+    request: Request,
+    query: str | None = Query(None),
+    limit: int | None = Query(None, ge=1, le=SQL_INT_MAX),
+    offset: int = Query(0, ge=0, le=SQL_INT_MAX),
+):
     """
     全用語を返す。
     ?query= で検索キーワードが指定された場合は部分一致でフィルタ。
+    空白で区切った複数のキーワードは、いずれかに一致すれば返す。
+    ?limit= / ?offset= でページングできる。
+    結果はキャッシュされ、ETag が一致すれば 304 を返す。
+    全件をメモリに載せないよう、JSON 配列を少しずつストリーミングで返す。
     """
+    key = (query, limit, offset)
+    version = await get_terms_version()
+    etag = f'W/"{version}-{hashlib.md5(repr(key).encode()).hexdigest()[:16]}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    cached = TERMS_CACHE.get(key)
+    if cached is not None and cached[0] == version:
+        # LRU: 使われたものを末尾に移し、古いものから追い出す
+        TERMS_CACHE[key] = TERMS_CACHE.pop(key)
+        return Response(content=cached[1], media_type="application/json", headers={"ETag": etag})
+
+    stmt = select(Term)
+
+    # 検索フィルター（空白区切りの複数語はいずれかに一致すればよい）
+    keywords = query.lower().split() if query else []
+    if keywords and FTS_ENABLED and all(len(k) >= FTS_MIN_QUERY_LENGTH for k in keywords):
+        stmt = stmt.where(Term.id.in_(fts_match(keywords)))
+    elif keywords:
+        stmt = stmt.where(or_(*(
+            column.contains(k, autoescape=True)
+            for k in keywords
+            for column in (func.lower(Term.word), func.lower(Term.reading), func.lower(Term.description))
+        )))
+
+    # ソート（読み→単語順）とページング
+    stmt = stmt.order_by(TERM_ORDER, Term.word).limit(limit).offset(offset)
+
+    # 最初のバッチまで読んでから応答を始める。DB エラーは 200 を返す前に 5xx になる
     session = SessionLocal()
     try:
-        terms = session.query(Term).all()
-
-        # 検索フィルター
-        if query:
-            query_lower = query.lower()
-            terms = [
-                t for t in terms
-                if query_lower in (t.word.lower() if t.word else "")
-                or query_lower in (t.reading.lower() if t.reading else "")
-                or query_lower in (t.description.lower() if t.description else "")
-            ]
-
-        # ソート（読み→単語順）
-        def sort_key(t: Term):
-            key = t.reading if t.reading and t.reading.strip() else t.word
-            return key
-        terms_sorted = sorted(terms, key=sort_key)
-
-        return [
-            TermOut(
-                id=t.id,
-                word=t.word,
-                reading=t.reading,
-                description=t.description,
-                image_url=t.image_url,
-            )
-            for t in terms_sorted
-        ]
-    finally:
-        session.close()
+        # 一覧と同じトランザクションで version を読み、取得中に更新が入っていないか確かめる
+        current = await session.scalar(select(TermsVersion.version))
+        result = await session.stream_scalars(stmt.execution_options(yield_per=TERMS_STREAM_BATCH))
+        partitions = result.partitions()
+        terms = await anext(partitions, None)
+    except BaseException:
+        await session.close()
+        raise
+
+    async def generate():
+        nonlocal terms
+        chunks = []
+        size = 0
+        prefix = b"["
+        # 行を読み終えたら送信完了を待たずに接続をプールへ返す（close は二度呼んでも問題ない）
+        try:
+            while terms is not None:
+                # バッチ単位で変換し、JSON 配列の括弧を外してつなげる
+                chunk = prefix + TERMS_ADAPTER.dump_json(TERMS_ADAPTER.validate_python(terms, from_attributes=True))[1:-1]
+                prefix = b","
+                # キャッシュに載る大きさの間だけ本文を保持しておく
+                if chunks is not None:
+                    size += len(chunk)
+                    if size <= TERMS_CACHE_MAX_BYTES:
+                        chunks.append(chunk)
+                    else:
+                        chunks = None
+                yield chunk
+                terms = await anext(partitions, None)
+        finally:
+            await session.close()
+        # 0 件なら "[" もまだ送っていない
+        closing = b"]" if prefix == b"," else b"[]"
+        yield closing
+
+        # 取得中に更新が入った場合は古い結果をキャッシュしない
+        if chunks is not None and current == version:
+            store_terms_cache(key, version, b"".join(chunks) + closing)
+
+    return SessionStreamingResponse(generate(), session, media_type="application/json", headers={"ETag": etag})
 
 @app.get("/term/{term_id}", response_model=TermOut)
-def get_term(term_id: int):
-    session = SessionLocal()
-    try:
-        t = session.get(Term, term_id)
-        if not t:
-            raise HTTPException(status_code=404, detail="Term not found")
-        return TermOut(
-            id=t.id,
-            word=t.word,
-            reading=t.reading,
-            description=t.description,
-            image_url=t.image_url,
-        )
-    finally:
-        session.close()
+async def get_term(term_id: int, session: AsyncSession = Depends(get_session)):
+    t = await session.get(Term, term_id)
+    if not t:
+        raise HTTPException(status_code=404, detail="Term not found")
+    return t
 
 # ---------------------
 # HTML を返すエンドポイント（ブラウザ用）
 # ---------------------
 @app.get("/web", response_class=HTMLResponse)
-def serve_web(request: Request, q: Optional[str] = Query(None)):
-    session = SessionLocal()
-    try:
-        # 全件 or 検索条件で絞り込み
-        if q:
-            terms = session.query(Term).filter(Term.word.contains(q) | Term.description.contains(q)).all()
-        else:
-            terms = session.query(Term).all()
-
-        # ソート（読み→単語）
-        terms_sorted = sorted(terms, key=lambda t: t.reading or t.word)
-        return templates.TemplateResponse("index.html", {"request": request, "terms": terms_sorted, "q": q})
-    finally:
-        session.close()
+async def serve_web(request: Request, q: Optional[str] = Query(None), session: AsyncSession = Depends(get_session)):
+    # 全件 or 検索条件で絞り込み
+    stmt = select(Term)
+    if q:
+        stmt = stmt.where(Term.word.contains(q, autoescape=True) | Term.description.contains(q, autoescape=True))
+
+    # ソート（読み→単語）
+    result = await session.execute(stmt.order_by(TERM_ORDER, Term.word))
+    terms_sorted = result.scalars().all()
+    return templates.TemplateResponse("index.html", {"request": request, "terms": terms_sorted, "q": q})
 
 # 編集ページ表示
 @app.get("/edit/{term_id}", response_class=HTMLResponse)
-def edit_term_page(request: Request, term_id: int):
-    db = SessionLocal()
-    term = db.query(Term).filter(Term.id == term_id).first()
-    db.close()
+async def edit_term_page(request: Request, term_id: int, session: AsyncSession = Depends(get_session)):
+    term = await session.get(Term, term_id)
     if not term:
         raise HTTPException(status_code=404, detail="Term not found")
     return templates.TemplateResponse("edit.html", {"request": request, "term": term})
 
 # 編集内容の更新
 @app.post("/update/{term_id}")
-async def update_term(term_id: int, request: Request):
+async def update_term(term_id: int, request: Request, session: AsyncSession = Depends(get_session)):
     form = await request.form()
     word = form.get("word")
     reading = form.get("reading")
     description = form.get("description")
     image_url = form.get("image_url")
 
-    db = SessionLocal()
-    term = db.query(Term).filter(Term.id == term_id).first()
+    term = await session.get(Term, term_id)
     if not term:
-        db.close()
         raise HTTPException(status_code=404, detail="Term not found")
 
     term.word = word
@@ -217,8 +500,9 @@ async def update_term(term_id: int, request: Request):
     term.description = description
     term.image_url = image_url
 
-    db.commit()
-    db.close()
+    await bump_terms_version(session)
+    await session.commit()
+    expire_terms_version()
 
     # 一覧ページに戻る（正しいURLに）
     return RedirectResponse(url="/web", status_code=303)
\ No newline at end of file